@@ -13,7 +13,7 @@ if exist "requirements.txt" (
     pip install -r requirements.txt >nul 2>&1
 )
 
-python "comps.py" -d "%~1"
+python "comps.py" -d %*
 
 deactivate
 
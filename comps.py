@@ -4,12 +4,15 @@ import subprocess
 import sys 
 import shutil
 import re
+import select
 import time 
-import json
 import platform
+import tempfile
+import threading
 import urllib.request
 import zipfile
-import io
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 CRF_PRESETS = {
     '1_high_quality': 23, 
@@ -31,22 +34,67 @@ PRESET_OPTIONS = ['ultrafast', 'veryfast', 'fast', 'medium', 'slow', 'veryslow']
 GPU_ENCODERS = {
     'nvidia': 'h264_nvenc',
     'amd': 'h264_amf',
-    'intel': 'h264_qsv'
+    'intel': 'h264_qsv',
+    'vaapi': 'h264_vaapi'
 }
 
 DEFAULT_OUTPUT_PLACEHOLDER = 'AUTO_COMPRESSED_NAME'
 TEMP_FILE_NAME = 'temp_ffmpeg_output.mp4' 
 NOTIFICATION_ID = 'XV_COMPRESS_NOTIF'
+VAAPI_DEVICE = '/dev/dri/renderD128'
+ENCODER_PROBE_TIMEOUT = 5
+
+# x264 CRF -> encoder quantizer offset for roughly matching perceptual quality
+CRF_OFFSETS = {
+    'h264_nvenc': 2,
+    'h264_amf': 0,
+    'h264_qsv': 1
+}
+
+HWACCEL_ARGS = {
+    'h264_nvenc': ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda'],
+    'h264_amf': ['-hwaccel', 'auto'],
+    'h264_qsv': ['-hwaccel', 'qsv', '-hwaccel_output_format', 'qsv'],
+    'h264_vaapi': ['-vaapi_device', VAAPI_DEVICE, '-hwaccel', 'vaapi', '-hwaccel_output_format', 'vaapi']
+}
+
+HW_SCALE_FILTERS = {
+    'h264_nvenc': 'scale_cuda',
+    'h264_qsv': 'scale_qsv',
+    'h264_vaapi': 'scale_vaapi'
+}
 FFMPEG_URL = "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip"
+# Full static GPL release build (tried first); gyan.dev only ships its "full" builds as .7z.
+# The newest release-branch asset is looked up from the listing; FFMPEG_FULL_URL is the pinned backup.
+FFMPEG_RELEASES_API = "https://api.github.com/repos/BtbN/FFmpeg-Builds/releases/tags/latest"
+FFMPEG_RELEASE = '8.0'
+FFMPEG_FULL_URL = f"https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-n{FFMPEG_RELEASE}-latest-win64-gpl-{FFMPEG_RELEASE}.zip"
+
+_IS_WINDOWS = platform.system() == 'Windows'
+_IS_LINUX = platform.system() == 'Linux'
+_last_notif_t = 0.0
+_live_processes = set()
+_live_lock = threading.Lock()
+_cancelled = threading.Event()
+_CRF_FACTOR = tuple(max(0.05, min(1.3, 1.15 ** -(c - 23))) for c in range(52))
+_PRESET_FACTOR = {'ultrafast': 1.40, 'veryfast': 1.20, 'fast': 1.10, 'medium': 1.0, 'slow': 0.95, 'veryslow': 0.90}
+_W_RE = re.compile(r'^(\d+):')
+_FULL_ASSET_RE = re.compile(r'^ffmpeg-n(\d+)\.(\d+)-latest-win64-gpl-\1\.\2\.zip$')
+_SIZE_UNITS = ((1, 'B'), (1024, 'KB'), (1024**2, 'MB'), (1024**3, 'GB'))
+
+if os.name == 'nt':
+    import ctypes
+    _set_console_title = ctypes.windll.kernel32.SetConsoleTitleW
+    _set_console_title.argtypes = [ctypes.c_wchar_p]
 
 def set_terminal_title(title):
     if os.name == 'nt': 
-        safe_title = title.replace('|', '-').replace('&', 'and').replace('<', '[').replace('>', ']')
-        os.system(f'title {safe_title}')
+        _set_console_title(title)
     else:
         sys.stdout.write(f"\x1b]2;{title}\x07")
         sys.stdout.flush()
 
+@lru_cache(maxsize=8)
 def get_binary_path(binary_name):
     if shutil.which(binary_name):
         return binary_name
@@ -54,31 +102,44 @@ def get_binary_path(binary_name):
     script_dir = os.path.dirname(os.path.abspath(__file__))
     local_path = os.path.join(script_dir, binary_name)
     
-    if platform.system() == 'Windows':
+    if _IS_WINDOWS:
         if os.path.exists(local_path + ".exe"): return local_path + ".exe"
     
     if os.path.exists(local_path): return local_path
     return None
 
-def download_ffmpeg(is_desktop):
-    print("\n[!] FFmpeg binaries not found.")
-    print("    This is required to process videos.")
-    print(f"    Downloading portable FFmpeg from: {FFMPEG_URL}")
-    print("    This may take a minute depending on your internet connection...")
-    
+def _encoder_works(local_ffmpeg, encoder):
+    cmd = [local_ffmpeg, '-hide_banner', '-loglevel', 'error']
+    if encoder == 'h264_vaapi': cmd.extend(['-vaapi_device', VAAPI_DEVICE])
+    cmd.extend(['-f', 'lavfi', '-i', 'color=s=256x256:d=0.1', '-frames:v', '1'])
+    if encoder == 'h264_vaapi': cmd.extend(['-vf', 'format=nv12,hwupload'])
+    cmd.extend(['-c:v', encoder, '-f', 'null', '-'])
+    try: return subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=ENCODER_PROBE_TIMEOUT).returncode == 0
+    except (OSError, subprocess.TimeoutExpired): return False
+
+@lru_cache(maxsize=None)
+def _available_encoders():
+    local_ffmpeg = get_binary_path('ffmpeg')
+    if not local_ffmpeg: return frozenset()
     try:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        with urllib.request.urlopen(FFMPEG_URL) as response:
+        out = subprocess.run([local_ffmpeg, '-hide_banner', '-encoders'], capture_output=True, text=True, timeout=ENCODER_PROBE_TIMEOUT).stdout
+    except (OSError, subprocess.TimeoutExpired): return frozenset()
+    listed = [name for name in ('libx264',) + tuple(GPU_ENCODERS.values()) if name in out]
+    return frozenset(name for name in listed if name == 'libx264' or _encoder_works(local_ffmpeg, name))
+
+def _fetch_ffmpeg(url, is_desktop):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
+    try:
+        with urllib.request.urlopen(url) as response:
             total_size = int(response.info().get('Content-Length', 0))
             downloaded = 0
-            chunk_size = 8192
-            buffer = io.BytesIO()
+            chunk_size = 1 << 20
             
             while True:
                 chunk = response.read(chunk_size)
                 if not chunk: break
-                buffer.write(chunk)
+                tmp.write(chunk)
                 downloaded += len(chunk)
                 if total_size > 0:
                     percent = downloaded / total_size * 100
@@ -86,39 +147,66 @@ def download_ffmpeg(is_desktop):
                         set_terminal_title(f"Downloading FFmpeg: {percent:.1f}%")
                     print(f"\r    Downloading: {percent:.1f}%", end='')
             
-            print("\n    Download complete. Extracting...")
-            
-            with zipfile.ZipFile(buffer) as z:
-                for file_info in z.infolist():
-                    if file_info.filename.endswith('bin/ffmpeg.exe'):
-                        file_info.filename = 'ffmpeg.exe'
-                        z.extract(file_info, script_dir)
-                    elif file_info.filename.endswith('bin/ffprobe.exe'):
-                        file_info.filename = 'ffprobe.exe'
-                        z.extract(file_info, script_dir)
-                        
-        print("    [OK] FFmpeg installed successfully to script folder.\n")
-        return True
+        tmp.close()
+        print("\n    Download complete. Extracting...")
         
-    except Exception as e:
-        print(f"\n[!] Failed to download FFmpeg: {e}")
-        print("    Please download 'ffmpeg-release-essentials.zip' from gyan.dev")
-        print("    and extract 'ffmpeg.exe' and 'ffprobe.exe' to this folder manually.")
-        return False
+        found = set()
+        with zipfile.ZipFile(tmp.name) as z:
+            for file_info in z.infolist():
+                for exe in ('ffmpeg.exe', 'ffprobe.exe'):
+                    if file_info.filename.endswith('bin/' + exe):
+                        file_info.filename = exe
+                        z.extract(file_info, script_dir)
+                        found.add(exe)
+        if len(found) < 2: raise RuntimeError("ffmpeg.exe/ffprobe.exe not found in archive")
+
+    finally:
+        tmp.close()
+        try: os.unlink(tmp.name)
+        except OSError: pass
+
+def _resolve_full_url():
+    try:
+        import json
+        with urllib.request.urlopen(FFMPEG_RELEASES_API, timeout=15) as response:
+            assets = json.load(response).get('assets', [])
+        found = []
+        for asset in assets:
+            m = _FULL_ASSET_RE.match(asset.get('name', ''))
+            if m: found.append(((int(m.group(1)), int(m.group(2))), asset['browser_download_url']))
+        if found: return max(found)[1]
+    except Exception: pass
+    return FFMPEG_FULL_URL
+
+def download_ffmpeg(is_desktop):
+    print("\n[!] FFmpeg binaries not found.")
+    print("    This is required to process videos.")
+    
+    for url in (_resolve_full_url(), FFMPEG_URL):
+        print(f"    Downloading portable FFmpeg from: {url}")
+        print("    This may take a minute depending on your internet connection...")
+        try:
+            _fetch_ffmpeg(url, is_desktop)
+            print("    [OK] FFmpeg installed successfully to script folder.\n")
+            return True
+        except Exception as e:
+            if url == FFMPEG_URL:
+                print(f"\n[!] Failed to download FFmpeg: {e}")
+            else:
+                print(f"\n[!] Full FFmpeg build unavailable ({e}); falling back to the essentials build.")
+    
+    print("    Please download 'ffmpeg-release-essentials.zip' from gyan.dev")
+    print("    and extract 'ffmpeg.exe' and 'ffprobe.exe' to this folder manually.")
+    return False
 
-def convert_ffmpeg_size(size_str):
-    match = re.match(r'(\d+)KiB', size_str)
-    if not match: return size_str
-    value_kib = int(match.group(1))
-    bytes_value = value_kib * 1024
-    if bytes_value >= 1024**3: return f"{bytes_value / 1024**3:.2f}GB"
-    elif bytes_value >= 1024**2: return f"{bytes_value / 1024**2:.2f}MB"
-    elif bytes_value >= 1024: return f"{bytes_value / 1024:.2f}KB"
-    else: return f"{bytes_value}B"
+def _fmt_bytes(n):
+    i = min(max(n.bit_length() - 1, 0) // 10, 3)
+    d, suffix = _SIZE_UNITS[i]
+    return f"{n / d:.2f}{suffix}" if i else f"{n}B"
 
 def get_file_size_mb(filepath):
-    if not os.path.exists(filepath): return None
-    return os.path.getsize(filepath) / (1024 * 1024)
+    try: return os.stat(filepath).st_size / (1024 * 1024)
+    except OSError: return None
 
 def get_output_filename(input_path, output_name):
     if output_name == DEFAULT_OUTPUT_PLACEHOLDER:
@@ -134,52 +222,37 @@ def get_video_metadata(filepath):
     try:
         command = [
             local_ffprobe, '-v', 'error', '-select_streams', 'v:0',
-            '-show_entries', 'stream=avg_frame_rate,bit_rate,width,height,duration',
-            '-of', 'json', filepath
+            '-show_entries', 'stream=width,height,avg_frame_rate,duration,bit_rate',
+            '-of', 'csv=p=0:s=,', filepath
         ]
         result = subprocess.run(command, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)['streams'][0]
+        # csv fields follow ffprobe's own stream order, not the -show_entries order
+        width, height, fps_raw, duration, bitrate = result.stdout.strip().splitlines()[0].split(',')[:5]
         
-        fps_frac = data.get('avg_frame_rate', '0/1').split('/')
+        fps_frac = fps_raw.split('/')
         fps = float(fps_frac[0]) / float(fps_frac[1]) if len(fps_frac) == 2 and float(fps_frac[1]) != 0 else 0.0
         
         return {
             'fps': round(fps, 2),
-            'bitrate_kbps': int(data.get('bit_rate', 0)) / 1000,
-            'width': int(data.get('width', 0)),
-            'height': int(data.get('height', 0)),
-            'resolution': f"{data.get('width')}x{data.get('height')}",
-            'duration': float(data.get('duration', 0))
+            'bitrate_kbps': int(bitrate) / 1000 if bitrate.isdigit() else 0.0,
+            'width': int(width),
+            'height': int(height),
+            'resolution': f"{width}x{height}",
+            'duration': float(duration) if duration not in ('', 'N/A') else 0.0
         }
     except Exception:
         return {'fps': 0.0, 'bitrate_kbps': 0.0, 'width': 0, 'height': 0, 'resolution': 'N/A', 'duration': 0.0}
 
 def estimate_final_size(original_size_mb, crf, original_width, target_resolution, preset):
-    base_factor = 1.0 / (1.15 ** (crf - 23))
-    if base_factor > 1.3: base_factor = 1.3 
-    if base_factor < 0.05: base_factor = 0.05
+    base_factor = _CRF_FACTOR[crf] if 0 <= crf < 52 else (1.3 if crf < 0 else 0.05)
 
     res_factor = 1.0
-    if target_resolution and original_width > 0:
-        try:
-            target_w_str = target_resolution.split(':')[0]
-            target_w = int(target_w_str)
-            res_factor = (target_w / original_width) ** 2
-        except: res_factor = 1.0
+    w_match = _W_RE.match(target_resolution) if target_resolution and original_width > 0 else None
+    if w_match: res_factor = (int(w_match.group(1)) / original_width) ** 2
 
-    preset_modifiers = {'ultrafast': 1.40, 'veryfast': 1.20, 'fast': 1.10, 'medium': 1.0, 'slow': 0.95, 'veryslow': 0.90}
-    preset_factor = preset_modifiers.get(preset, 1.0)
-    
-    total_factor = max(base_factor * res_factor * preset_factor, 0.05)
+    total_factor = max(base_factor * res_factor * _PRESET_FACTOR.get(preset, 1.0), 0.05)
     return original_size_mb * total_factor
 
-def parse_time_to_seconds(time_str):
-    try:
-        parts = time_str.split(':')
-        if len(parts) == 3: return int(parts[0]) * 3600 + int(parts[1]) * 60 + float(parts[2])
-    except: return 0.0
-    return 0.0
-
 def format_seconds(seconds):
     if seconds < 60: return f"{int(seconds)}s"
     elif seconds < 3600:
@@ -190,18 +263,51 @@ def format_seconds(seconds):
         m, s = divmod(r, 60)
         return f"{int(h)}h {int(m)}m"
 
+@lru_cache(maxsize=None)
+def _which(binary_name):
+    return shutil.which(binary_name)
+
 def update_termux_notification(title, content, progress_percent=None):
-    if shutil.which('termux-notification'):
+    if _which('termux-notification'):
         cmd = ['termux-notification', '--id', NOTIFICATION_ID, '--title', title, '--content', content, '--alert-once']
         if progress_percent is not None:
              cmd.extend(['--priority', 'high', '--ongoing'])
         subprocess.run(cmd, check=False)
 
 def clear_termux_notification():
-    if shutil.which('termux-notification-remove'):
+    if _which('termux-notification-remove'):
         subprocess.run(['termux-notification-remove', NOTIFICATION_ID], check=False, stderr=subprocess.DEVNULL)
 
-def compress_video(params):
+def remove_partial_output(params):
+    if os.path.abspath(params['output_path']) == os.path.abspath(params['input_path']): return
+    try: os.remove(params['output_path'])
+    except OSError: pass
+
+def _drain_pipe(fd):
+    # Non-blocking fds are read until empty; on Windows (no select on pipes) one blocking read.
+    data = b''
+    while True:
+        try: chunk = os.read(fd, 65536)
+        except BlockingIOError: return data, False
+        if not chunk: return data, True
+        data += chunk
+        if _IS_WINDOWS: return data, False
+
+def _last_progress_record(buf):
+    # Returns the newest complete "-progress" block and the unconsumed tail of buf.
+    stop = buf.rfind(b'progress=')
+    if stop == -1: return None, buf
+    end = buf.find(b'\n', stop)
+    if end == -1:
+        stop = buf.rfind(b'progress=', 0, stop)
+        if stop == -1: return None, buf
+        end = buf.index(b'\n', stop)
+    start = buf.rfind(b'progress=', 0, stop)
+    start = buf.index(b'\n', start) + 1 if start != -1 else 0
+    return buf[start:end], buf[end + 1:]
+
+def compress_video(params, hwaccel=True, show_header=True):
+    global _last_notif_t
     input_path = params['input_path']
     output_path = params['output_path']
     crf = params['crf']
@@ -209,96 +315,144 @@ def compress_video(params):
     preset = params['preset']
     fps = params['fps']
     encoder = params['encoder']
+    enc_q = str(min(max(crf + CRF_OFFSETS.get(encoder, 0), 0), 51))
+    threads = params['threads']
     is_desktop = params['is_desktop']
-    temp_path = params['temp_output_path']
     duration = params['duration']
+    name = os.path.basename(input_path)
+    use_hw = hwaccel and encoder in HWACCEL_ARGS
     
     local_ffmpeg = get_binary_path('ffmpeg')
-    if not local_ffmpeg: return False
+    if not local_ffmpeg or _cancelled.is_set(): return False
 
     res_display = resolution if resolution else f"Original ({params['orig_w']}x{params['orig_h']})"
     fps_display = fps if fps else f"Original ({params['orig_fps']} fps)"
 
-    print(f"\n🎥 Starting compression:")
-    print(f"  Encoder:    {encoder}")
-    print(f"  CRF/QP:     {crf}")
-    print(f"  Resolution: {res_display}")
-    print(f"  FPS:        {fps_display}")
-    print(f"  Preset:     {preset}")
-    print(f"  Log Update: Every {params['log_interval']}s")
-    print(f"  Estimate:   OG {params['orig_size']:.1f} MB -> ~{params['est_size']:.1f} MB")
-    print("---")
-
-    cmd = [local_ffmpeg, '-y', '-i', input_path, '-loglevel', 'verbose']
+    if show_header:
+        print(f"\n🎥 Starting compression:")
+        print(f"  Input:      {name}")
+        print(f"  Encoder:    {encoder}")
+        print(f"  CRF/QP:     {crf}" + (f" (encoder q {enc_q})" if enc_q != str(crf) else ""))
+        print(f"  Resolution: {res_display}")
+        print(f"  FPS:        {fps_display}")
+        print(f"  Preset:     {preset}")
+        print(f"  Log Update: Every {params['log_interval']}s")
+        print(f"  Estimate:   OG {params['orig_size']:.1f} MB -> ~{params['est_size']:.1f} MB")
+        print("---")
+
+    cmd = [local_ffmpeg, '-y']
+    if use_hw: cmd.extend(HWACCEL_ARGS[encoder])
+    elif encoder == 'h264_vaapi': cmd.extend(['-vaapi_device', VAAPI_DEVICE])
+    cmd.extend(['-i', input_path, '-progress', 'pipe:1', '-nostats', '-loglevel', 'error'])
     cmd.extend(['-c:v', encoder])
     
-    if encoder == 'libx264': cmd.extend(['-crf', str(crf), '-preset', preset])
-    elif encoder == 'h264_nvenc': cmd.extend(['-rc', 'vbr', '-cq', str(crf), '-preset', 'p4']) 
-    elif encoder == 'h264_amf': cmd.extend(['-rc', 'cqp', '-qp_i', str(crf), '-qp_p', str(crf), '-quality', 'balanced'])
-    elif encoder == 'h264_qsv': cmd.extend(['-global_quality', str(crf), '-preset', 'medium'])
+    if encoder == 'libx264':
+        cmd.extend(['-crf', str(crf), '-preset', preset, '-threads', str(threads)])
+        if _IS_LINUX:
+            cmd.extend(['-x264-params', f"threads={threads or 'auto'}:sliced-threads=0"])
+    elif encoder == 'h264_nvenc': cmd.extend(['-rc', 'vbr', '-cq', enc_q, '-preset', 'p5', '-tune', 'hq'])
+    elif encoder == 'h264_amf': cmd.extend(['-usage', 'transcoding', '-rc', 'cqp', '-qp_i', enc_q, '-qp_p', enc_q, '-quality', 'quality'])
+    elif encoder == 'h264_qsv': cmd.extend(['-global_quality', enc_q, '-preset', 'medium'])
+    elif encoder == 'h264_vaapi': cmd.extend(['-qp', enc_q])
 
     cmd.extend(['-c:a', 'aac', '-b:a', '128k'])
 
     filters = []
-    if resolution: filters.append(f'scale={resolution}')
+    if resolution: filters.append(f"{HW_SCALE_FILTERS.get(encoder, 'scale') if use_hw else 'scale'}={resolution}")
     if fps: filters.append(f'fps={fps}')
+    # uploads software-decoded frames; frames already on the VAAPI device pass through
+    if encoder == 'h264_vaapi': filters.append('format=nv12|vaapi,hwupload')
     if filters: cmd.extend(['-vf', ','.join(filters)])
         
-    cmd.append(temp_path)
+    cmd.append(output_path)
 
     process = None
+    err_log = tempfile.TemporaryFile()
+    sys.stdout.flush()
     try:
-        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err_log)
+        with _live_lock:
+            _live_processes.add(process)
+            if _cancelled.is_set(): process.kill()
+        fd = process.stdout.fileno()
+        if not _IS_WINDOWS: os.set_blocking(fd, False)
         
         start_t = time.time()
         last_log_t = start_t
+        pending = b''
+        eof = False
+        progressed = False
         
-        while True:
-            line = process.stderr.readline()
-            if not line and process.poll() is not None: break
-            
-            if "frame=" in line:
-                curr_t = time.time()
-                raw = line.strip()
-                clean_line = re.sub(r'q=[\d.-]+\s*', '', raw)
-                
-                s_match = re.search(r'size=\s*(\d+KiB)', clean_line)
-                if s_match:
-                    clean_line = clean_line.replace(s_match.group(1), convert_ffmpeg_size(s_match.group(1)))
+        while not eof:
+            if not _IS_WINDOWS: select.select([fd], [], [], params['log_interval'])
+            chunk, eof = _drain_pipe(fd)
+            record, pending = _last_progress_record(pending + chunk)
+            if record is None: continue
+            if not progressed:
+                out_us = record.partition(b'out_time_us=')[2].partition(b'\n')[0]
+                progressed = out_us.isdigit() and int(out_us) > 0
+
+            curr_t = time.time()
+            if curr_t - last_log_t < params['log_interval']: continue
+
+            progress = dict(line.split('=', 1) for line in record.decode('utf-8', 'replace').splitlines() if '=' in line)
+            size = progress.get('total_size', '')
+            size_str = _fmt_bytes(int(size)) if size.isdigit() else 'N/A'
+            time_str = progress.get('out_time', '')[:-4] or 'N/A'
+            clean_line = f"frame={progress.get('frame', 0)} fps={progress.get('fps', 0)} size={size_str} time={time_str} bitrate={progress.get('bitrate', 'N/A')} speed={progress.get('speed', 'N/A')}"
+
+            percent = 0.0
+            eta_str = "--:--"
+            out_us = progress.get('out_time_us', '')
+
+            if out_us.isdigit() and duration > 0:
+                secs = int(out_us) / 1e6
+                percent = min((secs / duration) * 100, 99.9)
+                if percent > 0.1:
+                    elapsed = curr_t - start_t
+                    rem_secs = (elapsed / percent) * (100 - percent)
+                    eta_str = format_seconds(rem_secs)
+
+                clean_line += f" | {percent:.1f}% | ETA: {eta_str}"
+
+            # parallel batch jobs each get their own labelled line instead of sharing one
+            out_line = f"[{name}] {clean_line}\n" if params['batch'] else '\r' + clean_line
+            if _IS_WINDOWS:
+                # os.write would bypass WriteConsoleW and mangle non-ASCII file names
+                sys.stdout.write(out_line)
+                sys.stdout.flush()
+            else:
+                os.write(1, out_line.encode('utf-8', 'replace'))
+            last_log_t = curr_t
 
-                percent = 0.0
-                eta_str = "--:--"
-                t_match = re.search(r'time=(\d{2}:\d{2}:\d{2}\.\d+)', raw)
-                
-                if t_match and duration > 0:
-                    secs = parse_time_to_seconds(t_match.group(1))
-                    percent = min((secs / duration) * 100, 99.9)
-                    if percent > 0.1:
-                        elapsed = curr_t - start_t
-                        rem_secs = (elapsed / percent) * (100 - percent)
-                        eta_str = format_seconds(rem_secs)
-                    
-                    clean_line += f" | {percent:.1f}% | ETA: {eta_str}"
-
-                if curr_t - last_log_t >= params['log_interval']:
-                    print(f"\r{clean_line}", end='')
-                    sys.stdout.flush()
-                    last_log_t = curr_t
-                    
-                    if is_desktop:
-                        set_terminal_title(f"{percent:.0f}% - ETA {eta_str} - {os.path.basename(input_path)}")
-                    else:
-                        termux_content = f"Prog: {percent:.1f}% | ETA: {eta_str}\nOG: {params['orig_size']:.0f}MB -> Est: ~{params['est_size']:.0f}MB"
-                        update_termux_notification("Compressing Video...", termux_content, percent)
+            if is_desktop:
+                set_terminal_title(f"{percent:.0f}% - ETA {eta_str} - {name}")
+            elif curr_t - _last_notif_t >= max(5.0, params['log_interval'] * 2):
+                # each termux-notification call starts a JVM-backed process, so keep these sparse
+                _last_notif_t = curr_t
+                termux_content = f"Prog: {percent:.1f}% | ETA: {eta_str}\nOG: {params['orig_size']:.0f}MB -> Est: ~{params['est_size']:.0f}MB"
+                update_termux_notification(f"Compressing {name}...", termux_content, percent)
 
         process.wait()
-        print() 
+        if not params['batch']: print()
         
+        if process.returncode != 0 and _cancelled.is_set():
+            remove_partial_output(params)
+            return False
+
         if process.returncode != 0:
+            remove_partial_output(params)
+            if use_hw and not progressed:
+                # failed before encoding anything, most likely the hwaccel decode/filter setup;
+                # the error is reported by the software attempt if it fails too
+                print("[*] Hardware decoding failed, retrying with software decoding...")
+                return compress_video(params, hwaccel=False, show_header=False)
             print(f"[!] FFmpeg Error {process.returncode}")
+            err_log.seek(0)
+            err_text = err_log.read().decode('utf-8', 'replace').strip()
+            if err_text: print(err_text)
             return False
             
-        shutil.move(temp_path, output_path)
         return True
 
     except KeyboardInterrupt:
@@ -306,14 +460,22 @@ def compress_video(params):
         if process:
             process.kill()
             process.wait()
+        remove_partial_output(params)
         raise KeyboardInterrupt
 
     except Exception as e:
         print(f"\n[!] Error: {e}")
         if process:
             process.kill()
+            process.wait()
+        remove_partial_output(params)
         return False
 
+    finally:
+        err_log.close()
+        with _live_lock:
+            _live_processes.discard(process)
+
 def interactive_input(is_desktop, file_path=None):
     print("\n=== Universal Video Compressor ===")
     
@@ -334,14 +496,14 @@ def interactive_input(is_desktop, file_path=None):
     encoder = 'libx264'
     if is_desktop:
         print("\n--- Processing Method ---")
+        available = _available_encoders()
+        methods = [(k, v) for k, v in GPU_ENCODERS.items() if v in available]
         print("  1: CPU (High Quality) [Default]")
-        print("  2: GPU - NVIDIA (NVENC)")
-        print("  3: GPU - AMD (AMF)")
-        print("  4: GPU - INTEL (QSV)")
-        m = input("Choose (1-4): ").strip()
-        if m == '2': encoder = GPU_ENCODERS['nvidia']
-        elif m == '3': encoder = GPU_ENCODERS['amd']
-        elif m == '4': encoder = GPU_ENCODERS['intel']
+        for i, (k, v) in enumerate(methods, 2):
+            print(f"  {i}: GPU - {k.upper()} ({v.split('_', 1)[1].upper()})")
+        if not methods: print("  (No working GPU encoder detected)")
+        m = input(f"Choose (1-{len(methods)+1}): ").strip()
+        if m.isdigit() and 2 <= int(m) <= len(methods)+1: encoder = methods[int(m)-2][1]
     
     print("\n--- Quality (CRF/QP) ---")
     keys = sorted(CRF_PRESETS.keys())
@@ -403,34 +565,91 @@ def interactive_input(is_desktop, file_path=None):
             if val >= 0.1: log_interval = val
     except: pass
 
-    return {
+    return build_params(meta, {
         'input_path': path, 'output_path': out_path, 'crf': crf, 
         'resolution': res, 'fps': final_fps, 'preset': preset, 
         'encoder': encoder, 'is_desktop': is_desktop,
-        'orig_w': meta['width'], 'orig_h': meta['height'],
-        'orig_fps': meta['fps'], 'duration': meta['duration'],
-        'log_interval': log_interval
-    }
+        'log_interval': log_interval, 'threads': 0, 'batch': False
+    })
+
+def build_params(meta, choices):
+    final_out = get_output_filename(choices['input_path'], choices['output_path'])
+    orig_size = get_file_size_mb(choices['input_path'])
+    params = dict(choices)
+    params.update({
+        'output_path': final_out,
+        'temp_output_path': os.path.join(os.path.dirname(final_out), TEMP_FILE_NAME),
+        'duration': meta['duration'],
+        'orig_size': orig_size,
+        'est_size': estimate_final_size(orig_size, choices['crf'], meta['width'], choices['resolution'], choices['preset']),
+        'orig_w': meta['width'],
+        'orig_h': meta['height'],
+        'orig_fps': meta['fps']
+    })
+    return params
+
+def _path_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+def _unique_output(path, taken):
+    # e.g. clip.mp4 and clip.mkv would both map to clip_compressed.mp4
+    root, ext = os.path.splitext(path)
+    candidate, n = path, 2
+    while _path_key(candidate) in taken:
+        candidate = f"{root}_{n}{ext}"
+        n += 1
+    return candidate
+
+def compress_batch(jobs, max_workers):
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        return list(pool.map(compress_video, jobs))
+    except KeyboardInterrupt:
+        print("\n\n🛑 Stopping FFmpeg...")
+        _cancelled.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+        with _live_lock:
+            for process in _live_processes: process.kill()
+        raise
+    finally:
+        # workers clean up their partial outputs before exiting
+        pool.shutdown(wait=True)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument('input', nargs='?', help="Input file")
+    parser.add_argument('input', nargs='*', help="Input file(s); several files are compressed in parallel")
     parser.add_argument('-d', '--desktop', action='store_true', help="Enable Desktop mode")
-    parser.add_argument('-e', '--encoder', default='cpu', choices=['cpu', 'nvidia', 'amd', 'intel'], help="Encoder type")
+    parser.add_argument('-e', '--encoder', default='cpu', choices=['cpu', 'auto'] + list(GPU_ENCODERS), help="Encoder type (auto picks the first working GPU encoder)")
     parser.add_argument('-q', '--crf', type=int, default=28, help="CRF/Quality value (default 28)")
     parser.add_argument('-res', '--resolution', default='original', help="Resolution (e.g. 1080p, 720p, or original)")
     parser.add_argument('-fps', '--fps', default='original', help="FPS (e.g. 30, 60, or original)")
     parser.add_argument('-p', '--preset', default='medium', help="Encoder preset")
     parser.add_argument('-l', '--log', type=float, default=0.5, help="Log interval in seconds")
+    parser.add_argument('-t', '--threads', type=int, default=0, help="CPU encoder threads (default 0 = all cores)")
     parser.add_argument('-y', '--yes', action='store_true', help="Auto confirm keep file")
 
     args = parser.parse_args()
 
-    is_desktop = args.desktop or platform.system() == 'Windows'
+    is_desktop = args.desktop or _IS_WINDOWS
+    inputs = []
+    seen_inputs = set()
+    for p in args.input:
+        if not p: continue
+        if not (os.path.isfile(p) and os.access(p, os.R_OK)):
+            print(f"[!] Skipping '{p}': file not found or not readable.")
+        elif _path_key(p) in seen_inputs:
+            print(f"[!] Skipping '{p}': listed more than once.")
+        else:
+            seen_inputs.add(_path_key(p))
+            inputs.append(p)
+    if any(args.input) and not inputs:
+        print("[!] No valid input files.")
+        sys.exit(1)
     
     if not get_binary_path('ffmpeg') or not get_binary_path('ffprobe'):
-        if is_desktop or platform.system() == 'Windows':
+        if is_desktop or _IS_WINDOWS:
             download_ffmpeg(is_desktop)
+            get_binary_path.cache_clear()
             if not get_binary_path('ffmpeg'):
                 input("Press Enter to exit...")
                 sys.exit(1)
@@ -438,13 +657,18 @@ if __name__ == "__main__":
             print("[!] FFmpeg not found. Please install it using your package manager (e.g., pkg install ffmpeg).")
             sys.exit(1)
 
-    temp_out = None
+    temp_outs = []
     auto_confirm = False
 
     try:
-        if args.input:
-            enc_map = {'cpu': 'libx264', 'nvidia': 'h264_nvenc', 'amd': 'h264_amf', 'intel': 'h264_qsv'}
-            encoder = enc_map.get(args.encoder, 'libx264')
+        if inputs:
+            if args.encoder == 'auto':
+                encoder = next((v for v in GPU_ENCODERS.values() if v in _available_encoders()), 'libx264')
+            else:
+                encoder = GPU_ENCODERS.get(args.encoder, 'libx264')
+                if encoder != 'libx264' and encoder not in _available_encoders():
+                    print(f"[!] {encoder} is not available on this system, falling back to CPU (libx264).")
+                    encoder = 'libx264'
             
             res = None
             if args.resolution != 'original':
@@ -457,10 +681,8 @@ if __name__ == "__main__":
             if args.fps != 'original':
                 fps = args.fps
 
-            meta = get_video_metadata(args.input)
-            
-            settings = {
-                'input_path': args.input,
+            choices = {
+                'input_path': inputs[0],
                 'output_path': DEFAULT_OUTPUT_PLACEHOLDER,
                 'crf': args.crf,
                 'resolution': res,
@@ -468,43 +690,62 @@ if __name__ == "__main__":
                 'preset': args.preset,
                 'encoder': encoder,
                 'is_desktop': is_desktop,
-                'orig_w': meta['width'],
-                'orig_h': meta['height'],
-                'orig_fps': meta['fps'],
-                'duration': meta['duration'],
-                'log_interval': args.log
+                'log_interval': args.log,
+                'threads': args.threads,
+                'batch': len(inputs) > 1
             }
             auto_confirm = args.yes
+
+            if len(inputs) > 1:
+                workers = max(1, (os.cpu_count() or 2) // 2) if encoder == 'libx264' else 2
+                if encoder == 'libx264' and not args.threads:
+                    # share the cores between parallel x264 jobs instead of each taking all of them
+                    choices['threads'] = max(1, (os.cpu_count() or 2) // workers)
+
+                jobs = []
+                taken = set(seen_inputs)
+                for path in inputs:
+                    out = get_output_filename(path, DEFAULT_OUTPUT_PLACEHOLDER)
+                    if _path_key(out) in seen_inputs:
+                        # another worker would be reading the file this job truncates
+                        print(f"[!] Skipping '{path}': its output '{out}' is another input in this batch.")
+                        continue
+                    out = _unique_output(out, taken)
+                    taken.add(_path_key(out))
+                    job = build_params(get_video_metadata(path), dict(choices, input_path=path, output_path=out))
+                    temp_outs.append(job['temp_output_path'])
+                    jobs.append(job)
+                if not jobs:
+                    print("[!] Nothing left to compress.")
+                    sys.exit(1)
+
+                print(f"\n=== Batch: {len(jobs)} files, {workers} at a time ===")
+                if is_desktop: set_terminal_title("Processing batch...")
+
+                start_time = time.time()
+                results = compress_batch(jobs, workers)
+
+                print(f"\n☑ Batch done in {format_seconds(time.time() - start_time)}")
+                for job, ok in zip(jobs, results):
+                    final_size = get_file_size_mb(job['output_path']) if ok else None
+                    if final_size is not None:
+                        print(f"  [OK] {os.path.basename(job['output_path'])}: {job['orig_size']:.2f} MB -> {final_size:.2f} MB")
+                    else:
+                        print(f"  [!] {os.path.basename(job['input_path'])}: failed")
+                done = sum(1 for ok in results if ok)
+                if is_desktop: set_terminal_title(f"Done! {done}/{len(jobs)} files")
+                else:
+                    update_termux_notification("Compression Complete", f"{done}/{len(jobs)} files compressed")
+                sys.exit(0)
+
+            compress_params = build_params(get_video_metadata(inputs[0]), choices)
         else:
-            settings = interactive_input(is_desktop, None)
+            compress_params = interactive_input(is_desktop, None)
             auto_confirm = False
 
-        final_out = get_output_filename(settings['input_path'], settings['output_path'])
-        temp_out = os.path.join(os.path.dirname(final_out), TEMP_FILE_NAME)
-        orig_size = get_file_size_mb(settings['input_path'])
-        
-        est_size = estimate_final_size(
-            orig_size, settings['crf'], settings['orig_w'], settings['resolution'], settings['preset']
-        )
-
-        compress_params = {
-            'input_path': settings['input_path'],
-            'output_path': final_out,
-            'temp_output_path': temp_out,
-            'crf': settings['crf'],
-            'resolution': settings['resolution'],
-            'preset': settings['preset'],
-            'fps': settings['fps'],
-            'encoder': settings['encoder'],
-            'is_desktop': settings['is_desktop'],
-            'log_interval': settings['log_interval'],
-            'duration': settings['duration'],
-            'orig_size': orig_size,
-            'est_size': est_size,
-            'orig_w': settings['orig_w'],
-            'orig_h': settings['orig_h'],
-            'orig_fps': settings['orig_fps']
-        }
+        final_out = compress_params['output_path']
+        orig_size = compress_params['orig_size']
+        temp_outs.append(compress_params['temp_output_path'])
 
         if is_desktop: set_terminal_title("Processing...")
         
@@ -542,10 +783,13 @@ if __name__ == "__main__":
         print("\n\n[!] Operation Cancelled by User.")
         
     finally:
-        if temp_out and os.path.exists(temp_out):
+        # FFmpeg now writes straight to the final path; this only sweeps up
+        # temp files left behind by older versions of the script.
+        for temp_out in set(temp_outs):
             try:
                 os.remove(temp_out)
                 print("[*] Temp file cleaned up.")
+            except FileNotFoundError: pass
             except Exception as e:
                 print(f"[!] Warning: Could not remove temp file: {e}")
                 